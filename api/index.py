@@ -1,2 +0,0 @@
-# Vercel looks for app at api/index.py, api/app.py, or api/server.py.
-from main import app
@@ -2,6 +2,7 @@
 Vercel serverless API only. Frontend is served by Vercel from outputDirectory (frontend/dist).
 This function handles only /api/* — no static serving. Defensive so it never crashes.
 """
+import importlib.util
 import sys
 import traceback
 from pathlib import Path
@@ -14,17 +15,24 @@ _startup_error = None
 
 try:
     from fastapi import FastAPI
-    from fastapi.responses import JSONResponse
 
     backend_app = None
     backend_error = None
 
     if _backend_dir.exists() and (_backend_dir / "main.py").exists():
-        sys.path.insert(0, str(_backend_dir))
+        # Load backend/main.py by path under its own name: a bare "import main" could resolve to this
+        # module or any other "main" on sys.path. The backend's flat sibling imports (gemini_client,
+        # source_resolver) still need its directory on sys.path, appended so other lookups don't stat it first.
+        if str(_backend_dir) not in sys.path:
+            sys.path.append(str(_backend_dir))
         try:
-            from main import app as _backend_app  # noqa: E402
-            backend_app = _backend_app
+            _spec = importlib.util.spec_from_file_location("backend_main", _backend_dir / "main.py")
+            _backend_main = importlib.util.module_from_spec(_spec)
+            sys.modules["backend_main"] = _backend_main
+            _spec.loader.exec_module(_backend_main)
+            backend_app = _backend_main.app
         except Exception as e:
+            sys.modules.pop("backend_main", None)
             backend_error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
 
     app = FastAPI(title="Asktra API")
@@ -33,6 +41,8 @@ try:
         app.mount("/api", backend_app)
     else:
         def _api_err():
+            from fastapi.responses import JSONResponse
+
             return JSONResponse(
                 status_code=503,
                 content={
@@ -168,7 +168,9 @@ export default function Page() {
           const [, eventType, dataStr] = eventMatch;
           try {
             const data = JSON.parse(dataStr.trim()) as Record<string, unknown>;
-            if ((eventType === "step" || eventType === "status") && data.message) {
+            if (eventType === "steps" && Array.isArray(data.messages)) {
+              setThinkingSteps((prev) => [...prev, ...(data.messages as string[])]);
+            } else if ((eventType === "step" || eventType === "status") && data.message) {
               setThinkingSteps((prev) => [...prev, data.message as string]);
             } else if (eventType === "result") {
               setResult(data);
@@ -4,26 +4,64 @@ Uses GEMINI_API_KEY and optional GEMINI_MODEL (e.g. gemini-2.5-pro-preview, gemi
 For Phase 0 (Semantic Intent Mapping) and Phase 7 (Causal Reconciliation), set GEMINI_THINKING_LEVEL=HIGH
 to enable extended reasoning (thought chain) before answering — critical for Truth Gap detection.
 """
+import asyncio
 import base64
+import functools
+import hashlib
 import os
 import json
 import re
+import tempfile
+import threading
 import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
-# Prefer google-genai; fallback for older envs
+# orjson parses model output and dataset JSON in C; stdlib json is the fallback
 try:
-    from google import genai
-    from google.genai import types
-    HAS_GENAI = True
+    import orjson
+    _loads = orjson.loads
 except ImportError:
-    HAS_GENAI = False
+    orjson = None
+    _loads = json.loads
+
+# google-genai is imported on first use (GeminiClient.client) so cold starts on routes that
+# never call Gemini (/health, /dataset) don't pay for the SDK import.
+genai = None
+types = None
+
+
+def _import_genai():
+    global genai, types
+    if genai is None:
+        try:
+            from google import genai as _genai
+            from google.genai import types as _types
+        except ImportError as e:
+            raise RuntimeError("Install google-genai: pip install google-genai") from e
+        genai, types = _genai, _types
+    return genai
+
+
+# Parsed dataset files keyed by path -> (st_mtime_ns, value); re-read only when a file changes on disk.
+_DATASET_CACHE: dict[Path, tuple[int, Any]] = {}
+# Below this many bytes of changed files, thread start-up costs more than it saves; parse inline.
+_PARALLEL_PARSE_BYTES = 1 << 20
+
+
+def _parse_dataset_file(path: Path) -> Any:
+    if path.suffix == ".json":
+        return _loads(path.read_bytes())
+    return path.read_text(encoding="utf-8")
 
 
 def _load_dataset() -> dict[str, Any]:
     base = Path(__file__).parent / "dataset"
     data = {}
+    stale: list[tuple[str, Path, int]] = []
+    stale_bytes = 0
     for name, path in [
         ("slack", base / "slack.json"),
         ("git", base / "git.json"),
@@ -31,11 +69,25 @@ def _load_dataset() -> dict[str, Any]:
         ("releases", base / "releases.md"),
         ("docs", base / "docs.md"),
     ]:
-        if path.exists():
-            if path.suffix == ".json":
-                data[name] = json.loads(path.read_text(encoding="utf-8"))
-            else:
-                data[name] = path.read_text(encoding="utf-8")
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        cached = _DATASET_CACHE.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns:
+            data[name] = cached[1]
+            continue
+        data[name] = None  # placeholder keeps source order
+        stale.append((name, path, st.st_mtime_ns))
+        stale_bytes += st.st_size
+    if len(stale) > 1 and stale_bytes >= _PARALLEL_PARSE_BYTES:
+        with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+            values = list(pool.map(_parse_dataset_file, [path for _, path, _ in stale]))
+    else:
+        values = [_parse_dataset_file(path) for _, path, _ in stale]
+    for (name, path, mtime_ns), value in zip(stale, values):
+        _DATASET_CACHE[path] = (mtime_ns, value)
+        data[name] = value
     return data
 
 
@@ -44,9 +96,81 @@ def get_dataset_for_api() -> dict[str, Any]:
     return _load_dataset()
 
 
+# (source key, context header, JSON-serialize dict/list values) in the order sources appear in the context
+_SOURCE_SPECS = (
+    ("slack", "## Slack\n", True),
+    ("git", "## Git commits\n", True),
+    ("jira", "## Jira\n", True),
+    ("docs", "## Documentation\n", False),
+    ("releases", "## Release notes\n", False),
+)
+
+# Rendered "## Slack\n[...]" blocks for on-disk dataset values, keyed by source name -> (value, fragment).
+# The value is compared by identity, so an entry is reused until _load_dataset re-parses that file.
+_FRAGMENT_CACHE: dict[str, tuple[Any, str]] = {}
+
+
+def _dumps(val: Any) -> str:
+    """Indented JSON for the model context (UTF-8 kept as-is, matching orjson's output)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(val, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits in a pasted override
+    return json.dumps(val, indent=2, ensure_ascii=False)
+
+
+def _render_source(header: str, val: Any, is_json: bool) -> str:
+    return header + (_dumps(val) if is_json and isinstance(val, (dict, list)) else str(val))
+
+
+def _dataset_fragment(key: str, header: str, val: Any, is_json: bool) -> str:
+    """Context block for an unmodified dataset value; rendered once per dataset load."""
+    cached = _FRAGMENT_CACHE.get(key)
+    if cached is not None and cached[0] is val:
+        return cached[1]
+    fragment = _render_source(header, val, is_json)
+    _FRAGMENT_CACHE[key] = (val, fragment)
+    return fragment
+
+
+_PROMPTS_DIR = Path(__file__).parent / "prompts"
+# All prompts/*.txt, read on first use; ASKTRA_RELOAD_PROMPTS=1 re-reads from disk on every call (prompt editing)
+_PROMPTS: dict[str, str] | None = None
+_RELOAD_PROMPTS = os.environ.get("ASKTRA_RELOAD_PROMPTS", "").strip().upper() in ("1", "TRUE", "YES")
+
+
 def _load_prompt(name: str) -> str:
-    path = Path(__file__).parent / "prompts" / f"{name}.txt"
-    return path.read_text(encoding="utf-8") if path.exists() else ""
+    global _PROMPTS
+    if _RELOAD_PROMPTS:
+        path = _PROMPTS_DIR / f"{name}.txt"
+        return path.read_text(encoding="utf-8") if path.exists() else ""
+    if _PROMPTS is None:
+        _PROMPTS = {p.stem: p.read_text(encoding="utf-8") for p in _PROMPTS_DIR.glob("*.txt")}
+    return _PROMPTS.get(name, "")
+
+
+# {{placeholder}} -> {placeholder}; literal braces (JSON examples in prompts) are doubled for str.format.
+_PLACEHOLDER_OR_BRACE = re.compile(r"\{\{(\w+)\}\}|([{}])")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_template(text: str) -> str:
+    """Prompt text compiled once into a str.format template (the file on disk is unchanged)."""
+    return _PLACEHOLDER_OR_BRACE.sub(lambda m: "{" + m.group(1) + "}" if m.group(1) else m.group(2) * 2, text)
+
+
+def _load_template(name: str) -> str:
+    return _compile_template(_load_prompt(name))
+
+
+def _render_prompt(name: str, **values: str) -> str:
+    """Fill a prompt's {{placeholders}} in one pass; missing ones render empty."""
+    return _load_template(name).format_map(defaultdict(str, values))
+
+
+# A JSON string literal (opaque, escapes included) or a single brace; drives the brace matcher in _extract_json
+_JSON_BODY = re.compile(r'(?s)"(?:\\.|[^"\\])*"|[{}]')
 
 
 def _extract_json(text: str) -> dict:
@@ -55,40 +179,53 @@ def _extract_json(text: str) -> dict:
         return {}
     # Try direct parse first (API may return pure JSON)
     try:
-        return json.loads(text)
+        return _loads(text)
     except json.JSONDecodeError:
         pass
-    # Strip markdown code block if present
-    if "```json" in text:
-        text = text.split("```json", 1)[1].split("```", 1)[0].strip()
-    elif "```" in text:
-        text = text.split("```", 1)[1].split("```", 1)[0].strip()
+    # Strip markdown code block if present (find + one slice; an unclosed fence runs to the end)
+    i = text.find("```json")
+    if i != -1:
+        i += 7
+    else:
+        i = text.find("```")
+        if i != -1:
+            i += 3
+    if i != -1:
+        j = text.find("```", i)
+        text = (text[i:j] if j != -1 else text[i:]).strip()
     try:
-        return json.loads(text)
+        return _loads(text)
     except json.JSONDecodeError:
         pass
-    # Find first { ... } by brace matching
+    # Find first { ... } by brace matching; string literals are consumed whole so braces inside them don't count
     start = text.find("{")
     if start == -1:
         return {}
     depth = 0
     end = -1
-    for i in range(start, len(text)):
-        if text[i] == "{":
+    for m in _JSON_BODY.finditer(text, start):
+        tok = m.group()
+        if tok == "{":
             depth += 1
-        elif text[i] == "}":
+        elif tok == "}":
             depth -= 1
             if depth == 0:
-                end = i
+                end = m.start()
                 break
     if end == -1:
         return {}
     try:
-        return json.loads(text[start : end + 1])
+        return _loads(text[start : end + 1])
     except json.JSONDecodeError:
         return {}
 
 
+def _is_json_object(text: str) -> bool:
+    """True when _extract_json finds a non-empty object in text; gates caching of JSON-mode replies."""
+    out = _extract_json(text)
+    return isinstance(out, dict) and bool(out)
+
+
 def _fallback_post_mortem(causal: dict[str, Any]) -> str:
     """Minimal incident report when the model returns empty."""
     root = causal.get("root_cause") or "Not determined."
@@ -138,6 +275,85 @@ def _fallback_slack_summary(causal: dict[str, Any]) -> str:
     )
 
 
+def _prior_context_block(prior_context: str | None) -> str:
+    if prior_context and prior_context.strip():
+        return f"\nPrior established knowledge (from this session):\n{prior_context.strip()}\n"
+    return ""
+
+
+def _version_result(out: dict) -> dict[str, Any]:
+    return {
+        "inferred_version": out.get("inferred_version", "unknown"),
+        "confidence": float(out.get("confidence", 0)),
+        "evidence": out.get("evidence", []),
+        "ambiguity_note": out.get("ambiguity_note", ""),
+    }
+
+
+def _causal_result(out: dict) -> dict[str, Any]:
+    return {
+        "root_cause": out.get("root_cause", ""),
+        "contradictions": out.get("contradictions", []),
+        "risk": out.get("risk", ""),
+        "fix_steps": out.get("fix_steps", []),
+        "verification": out.get("verification", ""),
+        "sources": out.get("sources", []),
+        "reasoning_trace": out.get("reasoning_trace", []),
+        "truth_gaps": out.get("truth_gaps", []),
+    }
+
+
+_RESPONSE_CACHE_SIZE = 256
+
+# On-disk response cache under the temp dir (/tmp is the writable path on Vercel); created on first use
+_DISK_CACHE_DIR = Path(tempfile.gettempdir()) / "asktra_cache"
+_DISK_CACHE_SIZE_LIMIT = 32 * 1024 * 1024
+_DISK_CACHE_TTL = 3600  # seconds
+_DISK_CACHE = None
+_DISK_CACHE_TRIED = False
+
+
+def _disk_cache():
+    """Shared diskcache.Cache, or None when diskcache is not installed or the cache can't be opened."""
+    global _DISK_CACHE, _DISK_CACHE_TRIED
+    if not _DISK_CACHE_TRIED:
+        _DISK_CACHE_TRIED = True
+        try:
+            import diskcache
+            _DISK_CACHE = diskcache.Cache(str(_DISK_CACHE_DIR), size_limit=_DISK_CACHE_SIZE_LIMIT)
+        except Exception:
+            _DISK_CACHE = None
+    return _DISK_CACHE
+
+_BUNDLE_USER = "Generate the three artifacts as JSON. Return only valid JSON with keys: post_mortem, pr_diff, slack_summary."
+_BUNDLE_ATTEMPTS = 3
+_BUNDLE_MAX_BACKOFF = 4.0  # seconds of sleep across all retries of one bundle
+
+
+def _bundle_backoff():
+    """Seconds to wait before each bundle attempt: 0, 1, 2, … capped so the total stays within _BUNDLE_MAX_BACKOFF."""
+    budget = _BUNDLE_MAX_BACKOFF
+    for attempt in range(_BUNDLE_ATTEMPTS):
+        delay = min(float(attempt), budget)
+        budget -= delay
+        yield delay
+
+
+def _parse_bundle(raw: str) -> dict[str, str] | None:
+    """Bundle sections from a model response, or None when every section is empty."""
+    out = _extract_json(raw)
+    post_mortem = (out.get("post_mortem") or out.get("incident_report") or "").strip()
+    pr_diff = (out.get("pr_diff") or out.get("remedy_patch") or "").strip()
+    slack_summary = (out.get("slack_summary") or out.get("stakeholder_summary") or "").strip()
+    if not (post_mortem or pr_diff or slack_summary):
+        return None
+    return {
+        "post_mortem": post_mortem or "(No content generated for this section.)",
+        "pr_diff": pr_diff or "(No content generated for this section.)",
+        "slack_summary": slack_summary or "(No content generated for this section.)",
+    }
+
+
 class GeminiClient:
     def __init__(
         self,
@@ -147,20 +363,41 @@ class GeminiClient:
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY", "")
         self.model = model or os.environ.get("GEMINI_MODEL", "gemini-3-flash-preview")
         self._client = None
-        self._dataset = None
+        # Process-constant settings, read once per client rather than on every call
+        self._thinking_high = os.environ.get("GEMINI_THINKING_LEVEL", "").strip().upper() == "HIGH"
+        self._is_gemini3 = "gemini-3" in (self.model or "").lower()
+        self._use_bundle_fallback = os.environ.get("USE_BUNDLE_FALLBACK", "").strip().upper() in ("1", "TRUE", "YES")
+        self._context_cache: dict[tuple[str, ...], str] = {}
+        # Opt-in: identical prompts (same system/user/image/model) reuse the previous model response
+        self._response_cache_enabled = os.environ.get("ASKTRA_RESPONSE_CACHE", "").strip().upper() in ("1", "TRUE", "YES")
+        self._response_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        # Opt-in: share responses across processes/cold starts through diskcache (optional dependency)
+        self._disk_cache_enabled = os.environ.get("ASKTRA_DISK_CACHE", "").strip().upper() in ("1", "TRUE", "YES")
+        # ask() uses one fused Gemini call by default; ASKTRA_FUSED_ASK=0 restores the two-call pipeline
+        self.fused_ask = os.environ.get("ASKTRA_FUSED_ASK", "").strip().upper() not in ("0", "FALSE", "NO")
 
     @property
     def client(self):
-        if not HAS_GENAI:
-            raise RuntimeError("Install google-genai: pip install google-genai")
         if self._client is None:
-            self._client = genai.Client(api_key=self.api_key)
+            self._client = _import_genai().Client(api_key=self.api_key)
         return self._client
 
+    @functools.cached_property
+    def dataset(self) -> dict[str, Any]:
+        return _load_dataset()
+
     def get_dataset(self) -> dict[str, Any]:
-        if self._dataset is None:
-            self._dataset = _load_dataset()
-        return self._dataset
+        return self.dataset
+
+    @functools.cached_property
+    def dataset_digest(self) -> bytes:
+        """BLAKE2b digest of this client's dataset; a stable cache key for anything derived from it."""
+        if orjson is not None:
+            raw = orjson.dumps(self.dataset, option=orjson.OPT_SORT_KEYS)
+        else:
+            raw = json.dumps(self.dataset, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).digest()
 
     def _normalize_override(self, value: Any, key: str) -> Any:
         """Parse override: JSON string for slack/git/jira, else string."""
@@ -180,29 +417,49 @@ class GeminiClient:
         include_sources: list[str] | None = None,
         dataset_overrides: dict[str, Any] | None = None,
     ) -> str:
-        data = dict(self.get_dataset())
+        specs = _SOURCE_SPECS
+        if include_sources:
+            specs = tuple(spec for spec in specs if spec[0] in include_sources)
+        # Without overrides the context depends only on the source selection (dataset is memoized per client)
+        cache_key = tuple(spec[0] for spec in specs)
+        if not dataset_overrides and cache_key in self._context_cache:
+            return self._context_cache[cache_key]
+        base = self.get_dataset()
+        # Copy only when overrides will be written into it; the cached dataset is never mutated
+        data = dict(base) if dataset_overrides else base
+        overridden: set[str] = set()
         if dataset_overrides:
             for k, v in dataset_overrides.items():
                 if v is not None and v != "":
                     data[k] = self._normalize_override(v, k)
-        keys = ["slack", "git", "jira", "docs", "releases"]
-        if include_sources:
-            keys = [k for k in keys if k in include_sources]
+                    overridden.add(k)
         parts = []
-        if "slack" in keys and data.get("slack") is not None:
-            val = data["slack"]
-            parts.append("## Slack\n" + (json.dumps(val, indent=2) if isinstance(val, (dict, list)) else str(val)))
-        if "git" in keys and data.get("git") is not None:
-            val = data["git"]
-            parts.append("## Git commits\n" + (json.dumps(val, indent=2) if isinstance(val, (dict, list)) else str(val)))
-        if "jira" in keys and data.get("jira") is not None:
-            val = data["jira"]
-            parts.append("## Jira\n" + (json.dumps(val, indent=2) if isinstance(val, (dict, list)) else str(val)))
-        if "docs" in keys and data.get("docs") is not None:
-            parts.append("## Documentation\n" + str(data["docs"]))
-        if "releases" in keys and data.get("releases") is not None:
-            parts.append("## Release notes\n" + str(data["releases"]))
-        return "\n\n".join(parts) if parts else ""
+        for key, header, is_json in specs:
+            val = data.get(key)
+            if val is None:
+                continue
+            if key in overridden:
+                parts.append(_render_source(header, val, is_json))
+            else:
+                parts.append(_dataset_fragment(key, header, val, is_json))
+        context = "\n\n".join(parts) if parts else ""
+        if not dataset_overrides:
+            self._context_cache[cache_key] = context
+        return context
+
+    def _response_key(
+        self,
+        system: str,
+        user: str,
+        json_mode: bool,
+        image_base64: str | None,
+        image_mime: str,
+        use_thinking: bool,
+    ) -> bytes:
+        raw = "\x00".join(
+            (system, user, str(json_mode), image_base64 or "", image_mime or "", str(use_thinking), self.model)
+        )
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
 
     def _generate(
         self,
@@ -212,11 +469,84 @@ class GeminiClient:
         image_base64: str | None = None,
         image_mime: str = "image/png",
         use_thinking: bool = True,
+        image_bytes: bytes | None = None,
+        cache: bool = True,
     ) -> str:
+        """Model response text. cache=False skips the response cache entirely, for callers that validate
+        the text first and store it themselves with _store_response once it parses. In json_mode only
+        replies that yield a JSON object are cached, so an "overloaded" notice is never replayed."""
+        if not cache or not (self._response_cache_enabled or self._disk_cache_enabled):
+            return self._generate_uncached(system, user, json_mode, image_base64, image_mime, use_thinking, image_bytes)
+        key = self._response_key(system, user, json_mode, image_base64, image_mime, use_thinking)
+        cached = self._lookup_response(key)
+        if cached is not None:
+            return cached
+        text = self._generate_uncached(system, user, json_mode, image_base64, image_mime, use_thinking, image_bytes)
+        if not json_mode or _is_json_object(text):
+            self._store_response(key, text)
+        return text
+
+    def _remember(self, key: bytes, text: str) -> None:
+        with self._response_cache_lock:
+            self._response_cache[key] = text
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _lookup_response(self, key: bytes) -> str | None:
+        """Cached response text: in-memory LRU, then the on-disk cache (survives serverless cold starts)."""
+        if self._response_cache_enabled:
+            with self._response_cache_lock:
+                cached = self._response_cache.get(key)
+                if cached is not None:
+                    self._response_cache.move_to_end(key)
+                    return cached
+        disk = _disk_cache() if self._disk_cache_enabled else None
+        if disk is None:
+            return None
+        try:
+            cached = disk.get(key)
+        except Exception:
+            return None
+        if not cached:
+            return None
+        if self._response_cache_enabled:
+            self._remember(key, cached)
+        return cached
+
+    def _store_response(self, key: bytes, text: str) -> None:
+        """Cache text in memory and on disk. Empty responses are retried by callers, so never cache them."""
+        if not (text and text.strip()):
+            return
+        disk = _disk_cache() if self._disk_cache_enabled else None
+        if disk is not None:
+            try:
+                disk.set(key, text, expire=_DISK_CACHE_TTL)
+            except Exception:
+                pass
+        if self._response_cache_enabled:
+            self._remember(key, text)
+
+    def _generate_uncached(
+        self,
+        system: str,
+        user: str,
+        json_mode: bool = True,
+        image_base64: str | None = None,
+        image_mime: str = "image/png",
+        use_thinking: bool = True,
+        image_bytes: bytes | None = None,
+    ) -> str:
+        client = self.client  # imports google-genai (and `types`) on first call
         contents: Any = f"{system}\n\n---\n\n{user}"
-        if image_base64 and image_base64.strip():
+        if image_bytes is None and image_base64 and image_base64.strip() and image_base64.isascii():
+            # ask() passes pre-validated bytes (b"" when invalid); this is the one-off fallback for other callers
+            try:
+                image_bytes = base64.b64decode(image_base64, validate=False)
+            except Exception:
+                image_bytes = None
+        if image_bytes:
             try:
-                image_bytes = base64.b64decode(image_base64, validate=True)
                 if hasattr(types, "Part") and hasattr(types.Part, "from_text"):
                     text_part = types.Part.from_text(contents)
                     if hasattr(types.Part, "from_bytes"):
@@ -247,8 +577,7 @@ class GeminiClient:
                 pass
         # Phase 0 / Phase 7: extended reasoning (skip for bundle to avoid overload/empty response)
         if use_thinking:
-            thinking_level = os.environ.get("GEMINI_THINKING_LEVEL", "").strip().upper()
-            if thinking_level == "HIGH" and hasattr(types, "ThinkingConfig"):
+            if self._thinking_high and hasattr(types, "ThinkingConfig"):
                 try:
                     config_kw["thinking_config"] = types.ThinkingConfig(thinking_level="HIGH")
                 except Exception:
@@ -258,7 +587,7 @@ class GeminiClient:
         except Exception:
             config = types.GenerateContentConfig(response_mime_type="application/json") if json_mode else None
         try:
-            response = self.client.models.generate_content(
+            response = client.models.generate_content(
                 model=self.model,
                 contents=contents,
                 config=config,
@@ -276,27 +605,39 @@ class GeminiClient:
             return ""
         parts = getattr(response.candidates[0].content, "parts", None) or []
         # When thinking is enabled, parts can be [thought_part, ..., text_part]. Use the part that looks like JSON (main output).
-        text_parts = []
+        # One forward pass: the last bundle-shaped JSON part wins, then the last part with braces, then the last text.
+        texts: list[str] = []
+        best_bundle = best_braces = None
+        mentions_bundle = False
         for p in parts:
             t = getattr(p, "text", None) if p else None
-            if t and isinstance(t, str) and t.strip():
-                text_parts.append((p, t.strip()))
-        if not text_parts:
+            if not (t and isinstance(t, str)):
+                continue
+            t = t.strip()
+            if not t:
+                continue
+            texts.append(t)
+            is_bundle = "post_mortem" in t or "pr_diff" in t
+            mentions_bundle = mentions_bundle or is_bundle
+            if "{" in t and "}" in t:
+                best_braces = t
+                if is_bundle or "slack_summary" in t:
+                    best_bundle = t
+        if not texts:
             first = parts[0] if parts else None
             return getattr(first, "text", None) or str(first) if first else ""
-        # Prefer the chunk that contains JSON (actual response); otherwise use last (main answer usually last).
-        for _p, t in reversed(text_parts):
-            if "{" in t and "}" in t and ("post_mortem" in t or "pr_diff" in t or "slack_summary" in t):
-                return t
-        for _p, t in reversed(text_parts):
-            if "{" in t and "}" in t:
-                return t
+        if best_bundle or best_braces:
+            return best_bundle or best_braces
         # If multiple parts, concatenate in case JSON was split (e.g. thinking models)
-        if len(text_parts) > 1:
-            combined = "\n".join(t for _, t in text_parts)
-            if "post_mortem" in combined or "pr_diff" in combined:
-                return combined
-        return text_parts[-1][1]
+        if len(texts) > 1 and mentions_bundle:
+            return "\n".join(texts)
+        return texts[-1]
+
+    def embed(self, text: str, model: str = "gemini-embedding-001") -> list[float]:
+        """Embedding vector for `text` (used by the semantic answer cache)."""
+        result = self.client.models.embed_content(model=model, contents=text)
+        embeddings = getattr(result, "embeddings", None) or []
+        return list(embeddings[0].values or []) if embeddings else []
 
     def infer_version(
         self,
@@ -305,20 +646,19 @@ class GeminiClient:
         dataset_overrides: dict[str, Any] | None = None,
         image_base64: str | None = None,
         image_mime: str = "image/png",
+        context: str | None = None,
+        image_bytes: bytes | None = None,
     ) -> dict[str, Any]:
-        prompt = _load_prompt("infer_version").replace("{{query}}", query)
-        context = self._build_context(include_sources, dataset_overrides)
+        prompt = _render_prompt("infer_version", query=query)
+        if context is None:
+            context = self._build_context(include_sources, dataset_overrides)
         user = f"Sources:\n{context}\n\nUser question: {query}"
         if image_base64:
             user += "\n\n[User attached an image/screenshot. Consider it when inferring version and evidence.]"
-        raw = self._generate(prompt, user, json_mode=True, image_base64=image_base64, image_mime=image_mime)
-        out = _extract_json(raw)
-        return {
-            "inferred_version": out.get("inferred_version", "unknown"),
-            "confidence": float(out.get("confidence", 0)),
-            "evidence": out.get("evidence", []),
-            "ambiguity_note": out.get("ambiguity_note", ""),
-        }
+        raw = self._generate(
+            prompt, user, json_mode=True, image_base64=image_base64, image_mime=image_mime, image_bytes=image_bytes
+        )
+        return _version_result(_extract_json(raw))
 
     def causal_reasoning(
         self,
@@ -329,32 +669,54 @@ class GeminiClient:
         prior_context: str | None = None,
         image_base64: str | None = None,
         image_mime: str = "image/png",
+        context: str | None = None,
+        image_bytes: bytes | None = None,
     ) -> dict[str, Any]:
-        prompt = _load_prompt("causal_reasoning")
-        prompt = prompt.replace("{{inferred_version}}", inferred_version).replace("{{query}}", query)
-        prior_block = ""
-        if prior_context and prior_context.strip():
-            prior_block = f"\nPrior established knowledge (from this session):\n{prior_context.strip()}\n"
-        prompt = prompt.replace("{{prior_context_block}}", prior_block)
-        context = self._build_context(include_sources, dataset_overrides)
+        prompt = _render_prompt(
+            "causal_reasoning",
+            inferred_version=inferred_version,
+            query=query,
+            prior_context_block=_prior_context_block(prior_context),
+        )
+        if context is None:
+            context = self._build_context(include_sources, dataset_overrides)
         user = f"Sources:\n{context}"
         if image_base64:
             user += "\n\n[User attached an image/screenshot (e.g. dashboard, latency graph). Does it align with the inferred version and timeout changes? Confirm or note discrepancies.]"
-        raw = self._generate(prompt, user, json_mode=True, image_base64=image_base64, image_mime=image_mime)
+        raw = self._generate(
+            prompt, user, json_mode=True, image_base64=image_base64, image_mime=image_mime, image_bytes=image_bytes
+        )
+        return _causal_result(_extract_json(raw))
+
+    def ask_fused(
+        self,
+        query: str,
+        include_sources: list[str] | None = None,
+        dataset_overrides: dict[str, Any] | None = None,
+        prior_context: str | None = None,
+        image_base64: str | None = None,
+        image_mime: str = "image/png",
+        context: str | None = None,
+        image_bytes: bytes | None = None,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Version inference and causal reasoning in a single model call (one round trip, context sent once).
+        Returns (version_result, causal) shaped like infer_version / causal_reasoning."""
+        prompt = _render_prompt(
+            "infer_and_reason", query=query, prior_context_block=_prior_context_block(prior_context)
+        )
+        if context is None:
+            context = self._build_context(include_sources, dataset_overrides)
+        user = f"Sources:\n{context}\n\nUser question: {query}"
+        if image_base64:
+            user += "\n\n[User attached an image/screenshot (e.g. dashboard, latency graph). Consider it when inferring version and evidence, and note whether it aligns with the inferred version and timeout changes.]"
+        raw = self._generate(
+            prompt, user, json_mode=True, image_base64=image_base64, image_mime=image_mime, image_bytes=image_bytes
+        )
         out = _extract_json(raw)
-        return {
-            "root_cause": out.get("root_cause", ""),
-            "contradictions": out.get("contradictions", []),
-            "risk": out.get("risk", ""),
-            "fix_steps": out.get("fix_steps", []),
-            "verification": out.get("verification", ""),
-            "sources": out.get("sources", []),
-            "reasoning_trace": out.get("reasoning_trace", []),
-            "truth_gaps": out.get("truth_gaps", []),
-        }
+        return _version_result(out), _causal_result(out)
 
     def emit_docs(self, inferred_version: str, causal: dict[str, Any]) -> str:
-        prompt = _load_prompt("emit_docs").replace("{{inferred_version}}", inferred_version)
+        prompt = _render_prompt("emit_docs", inferred_version=inferred_version)
         context = self._build_context()
         summary = json.dumps(causal, indent=2)
         user = f"Sources:\n{context}\n\nCausal analysis for this version:\n{summary}"
@@ -368,12 +730,12 @@ class GeminiClient:
         causal_summary: str = "",
     ) -> str:
         """Generate a PR body or patch description for a reconciliation finding (e.g. doc drift)."""
-        prompt = _load_prompt("emit_reconciliation_patch")
-        prompt = (
-            prompt.replace("{{finding_id}}", finding_id)
-            .replace("{{target}}", target)
-            .replace("{{action}}", action)
-            .replace("{{causal_summary}}", causal_summary or "No prior causal summary provided.")
+        prompt = _render_prompt(
+            "emit_reconciliation_patch",
+            finding_id=finding_id,
+            target=target,
+            action=action,
+            causal_summary=causal_summary or "No prior causal summary provided.",
         )
         user = "Generate the reconciliation PR body or patch description as Markdown."
         return self._generate(prompt, user, json_mode=False).strip()
@@ -388,10 +750,10 @@ class GeminiClient:
         """Self-correction loop: generate verification steps when contradictions exist (e.g. grep simulation, confirm outlier)."""
         if not contradictions:
             return []
-        prompt = _load_prompt("verify_contradiction")
-        prompt = (
-            prompt.replace("{{inferred_version}}", inferred_version)
-            .replace("{{contradictions}}", json.dumps(contradictions))
+        prompt = _render_prompt(
+            "verify_contradiction",
+            inferred_version=inferred_version,
+            contradictions=json.dumps(contradictions),
         )
         context = self._build_context(include_sources, dataset_overrides)
         user = f"Sources (for context):\n{context[:2000]}"
@@ -400,55 +762,85 @@ class GeminiClient:
         steps = out.get("verification_steps", [])
         return steps if isinstance(steps, list) else []
 
+    def _bundle_prompt(self, causal: dict[str, Any]) -> str:
+        return _render_prompt(
+            "reconciliation_bundle",
+            inferred_version=str(causal.get("inferred_version", "unknown")),
+            root_cause=str(causal.get("root_cause", "")),
+            contradictions=json.dumps(causal.get("contradictions") or []),
+            risk=str(causal.get("risk", "")),
+            fix_steps=json.dumps(causal.get("fix_steps") or []),
+            verification=str(causal.get("verification", "")),
+            sources=json.dumps(causal.get("sources") or []),
+        )
+
+    def _bundle_empty(self, causal: dict[str, Any]) -> dict[str, str]:
+        """All attempts came back empty: fallback content if USE_BUNDLE_FALLBACK is set, else raise."""
+        if self._use_bundle_fallback:
+            return {
+                "post_mortem": _fallback_post_mortem(causal),
+                "pr_diff": _fallback_pr_diff(causal),
+                "slack_summary": _fallback_slack_summary(causal),
+            }
+        raise RuntimeError(
+            "Model returned empty bundle. Please try again in a moment (Gemini may be busy). "
+            "To allow fallback content, set USE_BUNDLE_FALLBACK=1 in .env."
+        )
+
+    def _bundle_raw(self, prompt: str, use_thinking: bool, key: bytes, first: bool) -> str:
+        """One bundle attempt's response text. Only parsed bundles are cached (see _store_response calls below),
+        so the cache is consulted on the first attempt and retries always reach the model."""
+        if first:
+            cached = self._lookup_response(key)
+            if cached is not None:
+                return cached
+        return self._generate(prompt, _BUNDLE_USER, json_mode=True, use_thinking=use_thinking, cache=False)
+
     def generate_reconciliation_bundle(self, causal: dict[str, Any]) -> dict[str, str]:
         """Generate post_mortem (Markdown), pr_diff (Markdown), slack_summary (text) for the team.
         Uses use_thinking=False for reliability. Retries up to 3 times on empty; raises if no real content."""
-        prompt = _load_prompt("reconciliation_bundle")
-        prompt = (
-            prompt.replace("{{inferred_version}}", str(causal.get("inferred_version", "unknown")))
-            .replace("{{root_cause}}", str(causal.get("root_cause", "")))
-            .replace("{{contradictions}}", json.dumps(causal.get("contradictions") or []))
-            .replace("{{risk}}", str(causal.get("risk", "")))
-            .replace("{{fix_steps}}", json.dumps(causal.get("fix_steps") or []))
-            .replace("{{verification}}", str(causal.get("verification", "")))
-            .replace("{{sources}}", json.dumps(causal.get("sources") or []))
-        )
-        user = "Generate the three artifacts as JSON. Return only valid JSON with keys: post_mortem, pr_diff, slack_summary."
-        use_fallback = os.environ.get("USE_BUNDLE_FALLBACK", "").strip().upper() in ("1", "TRUE", "YES")
+        prompt = self._bundle_prompt(causal)
         # Use thinking for Gemini 3 so we get full model output; skip for other models
-        use_thinking = "gemini-3" in (self.model or "").lower()
-        for attempt in range(3):
-            raw = self._generate(prompt, user, json_mode=True, use_thinking=use_thinking)
-            out = _extract_json(raw)
-            post_mortem = (out.get("post_mortem") or out.get("incident_report") or "").strip()
-            pr_diff = (out.get("pr_diff") or out.get("remedy_patch") or "").strip()
-            slack_summary = (out.get("slack_summary") or out.get("stakeholder_summary") or "").strip()
-            if post_mortem or pr_diff or slack_summary:
-                return {
-                    "post_mortem": post_mortem or "(No content generated for this section.)",
-                    "pr_diff": pr_diff or "(No content generated for this section.)",
-                    "slack_summary": slack_summary or "(No content generated for this section.)",
-                }
-            if attempt < 2:
-                time.sleep(1 * (attempt + 1))
-                continue
-            if use_fallback:
-                post_mortem = _fallback_post_mortem(causal)
-                pr_diff = _fallback_pr_diff(causal)
-                slack_summary = _fallback_slack_summary(causal)
-                return {
-                    "post_mortem": post_mortem,
-                    "pr_diff": pr_diff,
-                    "slack_summary": slack_summary,
-                }
-            raise RuntimeError(
-                "Model returned empty bundle. Please try again in a moment (Gemini may be busy). "
-                "To allow fallback content, set USE_BUNDLE_FALLBACK=1 in .env."
-            )
-        raise RuntimeError("Model returned empty bundle; please try again later.")
+        use_thinking = self._is_gemini3
+        key = self._response_key(prompt, _BUNDLE_USER, True, None, "image/png", use_thinking)
+        for attempt, delay in enumerate(_bundle_backoff()):
+            if delay:
+                time.sleep(delay)
+            raw = self._bundle_raw(prompt, use_thinking, key, attempt == 0)
+            bundle = _parse_bundle(raw)
+            if bundle is not None:
+                self._store_response(key, raw)
+                return bundle
+        return self._bundle_empty(causal)
+
+    async def agenerate_reconciliation_bundle(self, causal: dict[str, Any]) -> dict[str, str]:
+        """Async generate_reconciliation_bundle: model calls run in a worker thread and backoff
+        uses asyncio.sleep, so neither blocks the event loop."""
+        prompt = self._bundle_prompt(causal)
+        use_thinking = self._is_gemini3
+        key = self._response_key(prompt, _BUNDLE_USER, True, None, "image/png", use_thinking)
+        for attempt, delay in enumerate(_bundle_backoff()):
+            if delay:
+                await asyncio.sleep(delay)
+            raw = await asyncio.to_thread(self._bundle_raw, prompt, use_thinking, key, attempt == 0)
+            bundle = _parse_bundle(raw)
+            if bundle is not None:
+                await asyncio.to_thread(self._store_response, key, raw)  # may write the disk cache
+                return bundle
+        return self._bundle_empty(causal)
+
+
+def decode_image_base64(image_base64: str | None) -> bytes:
+    """Decode an attached image once per request; b"" (attach nothing) when absent or not valid base64."""
+    if not image_base64 or not image_base64.strip():
+        return b""
+    try:
+        return base64.b64decode(image_base64, validate=True)
+    except (ValueError, TypeError):
+        return b""
 
 
-def ask(
+async def ask(
     gemini: GeminiClient,
     query: str,
     include_sources: list[str] | None = None,
@@ -457,14 +849,31 @@ def ask(
     image_base64: str | None = None,
     image_mime: str = "image/png",
 ) -> dict[str, Any]:
-    version_result = gemini.infer_version(query, include_sources, dataset_overrides, image_base64, image_mime)
-    inferred = version_result["inferred_version"]
-    causal = gemini.causal_reasoning(
-        query, inferred, include_sources, dataset_overrides, prior_context, image_base64, image_mime
-    )
+    context = gemini._build_context(include_sources, dataset_overrides)
+    image_bytes = decode_image_base64(image_base64)
+    version_result = causal = None
+    if gemini.fused_ask:
+        version_result, causal = await asyncio.to_thread(
+            gemini.ask_fused,
+            query,
+            include_sources,
+            dataset_overrides,
+            prior_context,
+            image_base64,
+            image_mime,
+            context=context,
+            image_bytes=image_bytes,
+        )
+        # Nothing usable came back (e.g. truncated JSON): fall back to the two-call pipeline
+        if not causal["root_cause"] and version_result["inferred_version"] == "unknown":
+            version_result = causal = None
+    if causal is None:
+        version_result, causal = await _ask_two_step(
+            gemini, query, include_sources, dataset_overrides, prior_context, image_base64, image_mime, context, image_bytes
+        )
     return {
         "query": query,
-        "inferred_version": inferred,
+        "inferred_version": version_result["inferred_version"],
         "confidence": version_result["confidence"],
         "evidence": version_result["evidence"],
         "ambiguity_note": version_result.get("ambiguity_note", ""),
@@ -479,6 +888,47 @@ def ask(
     }
 
 
+async def _ask_two_step(
+    gemini: GeminiClient,
+    query: str,
+    include_sources: list[str] | None,
+    dataset_overrides: dict[str, Any] | None,
+    prior_context: str | None,
+    image_base64: str | None,
+    image_mime: str,
+    context: str,
+    image_bytes: bytes,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    # Both calls share one context; the causal prompt is compiled while version inference is in flight.
+    version_result, _ = await asyncio.gather(
+        asyncio.to_thread(
+            gemini.infer_version,
+            query,
+            include_sources,
+            dataset_overrides,
+            image_base64,
+            image_mime,
+            context=context,
+            image_bytes=image_bytes,
+        ),
+        asyncio.to_thread(_load_template, "causal_reasoning"),
+    )
+    inferred = version_result["inferred_version"]
+    causal = await asyncio.to_thread(
+        gemini.causal_reasoning,
+        query,
+        inferred,
+        include_sources,
+        dataset_overrides,
+        prior_context,
+        image_base64,
+        image_mime,
+        context=context,
+        image_bytes=image_bytes,
+    )
+    return version_result, causal
+
+
 def emit_docs(gemini: GeminiClient, inferred_version: str, causal: dict[str, Any]) -> str:
     return gemini.emit_docs(inferred_version, causal)
 
@@ -495,3 +945,7 @@ def emit_reconciliation_patch(
 
 def generate_reconciliation_bundle(gemini: GeminiClient, causal: dict[str, Any]) -> dict[str, str]:
     return gemini.generate_reconciliation_bundle(causal)
+
+
+async def agenerate_reconciliation_bundle(gemini: GeminiClient, causal: dict[str, Any]) -> dict[str, str]:
+    return await gemini.agenerate_reconciliation_bundle(causal)
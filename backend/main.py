@@ -3,8 +3,12 @@ Asktra API: Cognitive Librarian for Software Systems.
 POST /ask — causal reasoning with automatic version inference.
 POST /emit-docs — PR-ready documentation emission.
 """
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import os
-import time
+import random
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -13,10 +17,10 @@ from dotenv import load_dotenv
 _env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(_env_path)
 
-# Defer google-genai check to get_gemini() so Vercel serverless never crashes at import (like Next.js API routes)
+# Defer google-genai check to get_gemini() so Vercel serverless never crashes at import (like Next.js API routes).
+# find_spec only locates the package; the SDK itself is imported on the first Gemini call.
 try:
-    from google import genai  # noqa: F401
-    _HAS_GENAI = True
+    _HAS_GENAI = importlib.util.find_spec("google.genai") is not None
 except ImportError:
     _HAS_GENAI = False
 
@@ -24,25 +28,53 @@ from contextlib import asynccontextmanager
 
 import json as _json
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, field_validator
+
+# fastapi.sse (FastAPI 0.135+) frames events and sends keep-alive pings; older versions frame SSE by hand.
+try:
+    from fastapi.sse import EventSourceResponse, ServerSentEvent
+except ImportError:
+    EventSourceResponse = ServerSentEvent = None
 
 from typing import Any
 
 from gemini_client import (
     GeminiClient,
+    agenerate_reconciliation_bundle as agenerate_reconciliation_bundle_engine,
     ask as ask_engine,
+    decode_image_base64,
     emit_docs as emit_docs_engine,
     emit_reconciliation_patch as emit_reconciliation_patch_engine,
-    generate_reconciliation_bundle as generate_reconciliation_bundle_engine,
 )
 from gemini_client import GeminiClient as _GC, get_dataset_for_api  # for type hint
-from source_resolver import get_source_details
+from response_cache import answer_cache, cacheable
+from source_resolver import dataset_mtime_key, get_source_details, warm_dataset
+
+# orjson encodes SSE payloads and /dataset straight to UTF-8 bytes; stdlib json is the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return _json.dumps(data, ensure_ascii=False)
 
 
-def _ask_stream(
+def _steps_event(buf: list[str]) -> tuple[str, dict]:
+    """One `steps` SSE event carrying every message queued since the last I/O boundary; empties buf."""
+    event = ("steps", {"messages": buf[:]})
+    buf.clear()
+    return event
+
+
+async def _ask_stream(
     client: _GC,
     query: str,
     include_sources: list[str] | None = None,
@@ -51,43 +83,78 @@ def _ask_stream(
     image_base64: str | None = None,
     image_mime: str | None = None,
 ):
-    """Yield (event_type, data) for SSE: status/step messages (all steps), then result."""
+    """Yield (event_type, data) for SSE: batched `steps` messages (all steps), then result.
+    Blocking Gemini calls run in worker threads; steps queued between them go out as one event per I/O boundary."""
     q = query.strip()
+    steps: list[str] = []
+    use_cache = answer_cache.enabled and cacheable(dataset_overrides, image_base64)
+    q_emb = None
+    if use_cache:
+        cached, hit, q_emb = await asyncio.to_thread(answer_cache.lookup, client, q, include_sources, prior_context)
+        if cached is not None:
+            label = "semantic cache" if hit == "semantic" else "answer cache"
+            steps.append(f"✓ Served from {label}")
+            yield _steps_event(steps)
+            yield ("result", {**cached, "query": q})
+            return
     sources_msg = ", ".join(include_sources) if include_sources else "Slack, Git, Jira, docs, releases"
-    yield ("step", {"message": f"Loading dataset ({sources_msg})…"})
+    steps.append(f"Loading dataset ({sources_msg})…")
     if image_base64:
-        yield ("step", {"message": "Including attached image in analysis (multimodal)…"})
+        steps.append("Including attached image in analysis (multimodal)…")
     if prior_context:
-        yield ("step", {"message": "Building on prior session knowledge…"})
-    yield ("step", {"message": "Inferring version from timestamps and release notes…"})
-    version_result = client.infer_version(q, include_sources, dataset_overrides, image_base64, image_mime or "image/png")
+        steps.append("Building on prior session knowledge…")
+    steps.append("Inferring version from timestamps and release notes…")
+    yield _steps_event(steps)
+    image_bytes = decode_image_base64(image_base64)
+    # Citation lookup needs the on-disk dataset indexed; do that while Gemini infers the version.
+    warm_sources = asyncio.create_task(asyncio.to_thread(warm_dataset))
+    version_result = await asyncio.to_thread(
+        client.infer_version,
+        q,
+        include_sources,
+        dataset_overrides,
+        image_base64,
+        image_mime or "image/png",
+        image_bytes=image_bytes,
+    )
     inferred = version_result.get("inferred_version", "unknown")
     conf = version_result.get("confidence", 0)
-    yield ("step", {"message": f"✓ Inferred version: {inferred} ({int(conf * 100)}% confidence)"})
+    steps.append(f"✓ Inferred version: {inferred} ({int(conf * 100)}% confidence)")
     for ev in version_result.get("evidence", [])[:3]:
-        yield ("step", {"message": f"  Evidence: {ev}"})
-    yield ("step", {"message": "Loading sources into context for causal reasoning…"})
-    yield ("step", {"message": "Reasoning over Slack intent vs Git implementation vs docs…"})
-    causal = client.causal_reasoning(
-        q, inferred, include_sources, dataset_overrides, prior_context, image_base64, image_mime or "image/png"
+        steps.append(f"  Evidence: {ev}")
+    steps.append("Loading sources into context for causal reasoning…")
+    steps.append("Reasoning over Slack intent vs Git implementation vs docs…")
+    yield _steps_event(steps)
+    causal = await asyncio.to_thread(
+        client.causal_reasoning,
+        q,
+        inferred,
+        include_sources,
+        dataset_overrides,
+        prior_context,
+        image_base64,
+        image_mime or "image/png",
+        image_bytes=image_bytes,
     )
-    yield ("step", {"message": "✓ Causal analysis complete. Extracting reasoning trace…"})
+    steps.append("✓ Causal analysis complete. Extracting reasoning trace…")
     for step in causal.get("reasoning_trace") or []:
-        yield ("step", {"message": f"  {step}"})
+        steps.append(f"  {step}")
     # Self-correction loop: when contradictions exist, run final verification before showing answer
     contradictions = causal.get("contradictions") or []
     if contradictions:
-        yield ("step", {"message": "Verifying inferred truth (self-correction loop)…"})
+        steps.append("Verifying inferred truth (self-correction loop)…")
+        yield _steps_event(steps)
         try:
-            verification_steps = client.verify_contradiction(
-                inferred, contradictions, include_sources, dataset_overrides
+            verification_steps = await asyncio.to_thread(
+                client.verify_contradiction, inferred, contradictions, include_sources, dataset_overrides
             )
             for msg in verification_steps:
-                yield ("step", {"message": f"  {msg}"})
-            yield ("step", {"message": "✓ Verification complete. Documentation outlier confirmed."})
+                steps.append(f"  {msg}")
+            steps.append("✓ Verification complete. Documentation outlier confirmed.")
         except Exception:
-            yield ("step", {"message": "  (Verification skipped)"})
-    yield ("step", {"message": "Resolving source citations (Slack, Git, Jira, docs)…"})
+            steps.append("  (Verification skipped)")
+    steps.append("Resolving source citations (Slack, Git, Jira, docs)…")
+    yield _steps_event(steps)
     result = {
         "query": q,
         "inferred_version": inferred,
@@ -103,9 +170,13 @@ def _ask_stream(
         "reasoning_trace": causal.get("reasoning_trace", []),
         "truth_gaps": causal.get("truth_gaps", []),
     }
+    await warm_sources
     result["source_details"] = get_source_details(result["sources"])
-    yield ("step", {"message": "✓ Sources resolved. Building answer…"})
-    payload = _build_ask_response(result, result["source_details"])
+    steps.append("✓ Sources resolved. Building answer…")
+    yield _steps_event(steps)
+    payload = AskResponse.model_validate(result).model_dump(mode="json")
+    if use_cache:
+        answer_cache.store(client, q, include_sources, prior_context, payload, q_emb)
     yield ("result", payload)
 
 
@@ -125,10 +196,11 @@ class SourceDetail(BaseModel):
 
 
 class AskResponse(BaseModel):
-    query: str
-    inferred_version: str
-    confidence: float
-    evidence: list[str]
+    """Every field is optional so raw model output validates directly (missing/null → empty)."""
+    query: str = ""
+    inferred_version: str = ""
+    confidence: float = 0.0
+    evidence: list[str] = []
     ambiguity_note: str = ""
     root_cause: str = ""
     contradictions: list[str] = []
@@ -140,6 +212,29 @@ class AskResponse(BaseModel):
     reasoning_trace: list[str] = []
     truth_gaps: list[str] = []
 
+    @field_validator("query", "inferred_version", "ambiguity_note", "root_cause", "risk", "verification", mode="before")
+    @classmethod
+    def _as_str(cls, v: Any) -> str:
+        return v if isinstance(v, str) else (str(v) if v is not None else "")
+
+    @field_validator(
+        "evidence", "contradictions", "fix_steps", "sources", "reasoning_trace", "truth_gaps", mode="before"
+    )
+    @classmethod
+    def _as_str_list(cls, v: Any) -> list:
+        # The model sometimes returns objects (e.g. {"step": 1, "action": "revert"}); keep them as JSON text
+        return [x if isinstance(x, str) else _dumps(x) for x in v] if isinstance(v, list) else []
+
+    @field_validator("source_details", mode="before")
+    @classmethod
+    def _as_list(cls, v: Any) -> list:
+        return v if isinstance(v, list) else []
+
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def _as_confidence(cls, v: Any) -> Any:
+        return v or 0
+
 
 class EmitDocsRequest(BaseModel):
     inferred_version: str = "unknown"
@@ -158,75 +253,62 @@ class EmitReconciliationPatchRequest(BaseModel):
     causal_summary: str | None = None  # optional: root_cause, contradictions, risk, etc.
 
 
-_gemini: GeminiClient | None = None
+# Keys and the google-genai check are resolved once at import; GeminiClient construction is cheap (the SDK
+# itself loads on the first call), so warm workers hand out ready clients without re-reading the environment.
+_API_KEY = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
+_GEMINI_READY = _HAS_GENAI and bool(_API_KEY)
+_BUNDLE_API_KEY = os.environ.get("GEMINI_BUNDLE_API_KEY")
+_BUNDLE_READY = _HAS_GENAI and bool(_BUNDLE_API_KEY or _API_KEY)
 
 
-def _build_ask_response(result: dict, source_details: list) -> dict:
-    def _str(v):
-        return v if isinstance(v, str) else (str(v) if v is not None else "")
-    def _list(v):
-        return v if isinstance(v, list) else []
-    return {
-        "query": _str(result.get("query")),
-        "inferred_version": _str(result.get("inferred_version")),
-        "confidence": float(result.get("confidence") or 0),
-        "evidence": _list(result.get("evidence")),
-        "ambiguity_note": _str(result.get("ambiguity_note")),
-        "root_cause": _str(result.get("root_cause")),
-        "contradictions": _list(result.get("contradictions")),
-        "risk": _str(result.get("risk")),
-        "fix_steps": _list(result.get("fix_steps")),
-        "verification": _str(result.get("verification")),
-        "sources": _list(result.get("sources")),
-        "source_details": source_details,
-        "reasoning_trace": _list(result.get("reasoning_trace")),
-        "truth_gaps": _list(result.get("truth_gaps")),
-    }
+def _new_gemini_bundle() -> GeminiClient:
+    if _BUNDLE_API_KEY:
+        # Use Gemini 3 for bundle when bundle key is set.
+        model = os.environ.get("GEMINI_BUNDLE_MODEL") or "gemini-3-flash-preview"
+        return GeminiClient(api_key=_BUNDLE_API_KEY, model=model)
+    return GeminiClient(api_key=_API_KEY)
+
+
+_gemini: GeminiClient | None = GeminiClient(api_key=_API_KEY) if _GEMINI_READY else None
+_gemini_bundle: GeminiClient | None = _new_gemini_bundle() if _BUNDLE_READY else None
+
+
+def _genai_missing() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="google-genai is not installed. Run: pip install google-genai",
+    )
 
 
 def get_gemini() -> GeminiClient:
     global _gemini
+    if _gemini is not None:
+        return _gemini
     if not _HAS_GENAI:
+        raise _genai_missing()
+    if not _GEMINI_READY:
         raise HTTPException(
             status_code=503,
-            detail="google-genai is not installed. Run: pip install google-genai",
+            detail="GEMINI_API_KEY or GOOGLE_API_KEY not set (set in Vercel env or .env)",
         )
-    if _gemini is None:
-        key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-        if not key:
-            raise HTTPException(
-                status_code=503,
-                detail="GEMINI_API_KEY or GOOGLE_API_KEY not set (set in Vercel env or .env)",
-            )
-        _gemini = GeminiClient(api_key=key)
+    # Only after lifespan shutdown cleared the singleton
+    _gemini = GeminiClient(api_key=_API_KEY)
     return _gemini
 
 
-_gemini_bundle: GeminiClient | None = None
-
-
 def get_gemini_bundle() -> GeminiClient:
-    """Use GEMINI_BUNDLE_API_KEY for reconciliation bundle (e.g. Gemini 3 key); fallback to main key.
-    When GEMINI_BUNDLE_API_KEY is set, we create a fresh client each time so the bundle key is always used."""
+    """Use GEMINI_BUNDLE_API_KEY for reconciliation bundle (e.g. Gemini 3 key); fallback to main key."""
+    global _gemini_bundle
+    if _gemini_bundle is not None:
+        return _gemini_bundle
     if not _HAS_GENAI:
+        raise _genai_missing()
+    if not _BUNDLE_READY:
         raise HTTPException(
             status_code=503,
-            detail="google-genai is not installed. Run: pip install google-genai",
+            detail="GEMINI_BUNDLE_API_KEY or GEMINI_API_KEY not set",
         )
-    bundle_key = os.environ.get("GEMINI_BUNDLE_API_KEY")
-    if bundle_key:
-        # Always use the bundle key when set (no cache). Use Gemini 3 for bundle when bundle key is set.
-        model = os.environ.get("GEMINI_BUNDLE_MODEL") or "gemini-3-flash-preview"
-        return GeminiClient(api_key=bundle_key, model=model)
-    global _gemini_bundle
-    if _gemini_bundle is None:
-        key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-        if not key:
-            raise HTTPException(
-                status_code=503,
-                detail="GEMINI_BUNDLE_API_KEY or GEMINI_API_KEY not set",
-            )
-        _gemini_bundle = GeminiClient(api_key=key)
+    _gemini_bundle = _new_gemini_bundle()
     return _gemini_bundle
 
 
@@ -252,7 +334,26 @@ app.add_middleware(
 )
 
 
-def _sse_stream(
+class _GZipExceptStream:
+    """GZipMiddleware for everything but /ask-stream. Starlette only skips text/event-stream itself from 0.46,
+    and older versions would compress and buffer the stream instead of flushing each event."""
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].rstrip("/").endswith("/ask-stream"):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+# Compress JSON/markdown bodies over 1 KB
+app.add_middleware(_GZipExceptStream, minimum_size=1024)
+
+
+async def _sse_events(
     query: str,
     include_sources: list[str] | None = None,
     dataset_overrides: dict[str, Any] | None = None,
@@ -260,46 +361,86 @@ def _sse_stream(
     image_base64: str | None = None,
     image_mime: str | None = None,
 ):
-    """Generator yielding SSE-formatted lines for /ask-stream."""
+    """Async generator of (event_type, data) for /ask-stream; failures become a final `error` event."""
     try:
         client = get_gemini()
-        for event_type, data in _ask_stream(
+        async for event_type, data in _ask_stream(
             client, query, include_sources, dataset_overrides, prior_context, image_base64, image_mime
         ):
-            payload = _json.dumps(data, ensure_ascii=False)
-            yield f"event: {event_type}\ndata: {payload}\n\n"
+            yield event_type, data
     except HTTPException:
         raise
     except Exception as e:
-        msg = str(e)
-        yield f"event: error\ndata: {_json.dumps({'detail': msg})}\n\n"
+        yield "error", {"detail": str(e)}
+
+
+async def _sse_stream(
+    query: str,
+    include_sources: list[str] | None = None,
+    dataset_overrides: dict[str, Any] | None = None,
+    prior_context: str | None = None,
+    image_base64: str | None = None,
+    image_mime: str | None = None,
+):
+    """Async generator yielding hand-framed SSE lines (used when fastapi.sse is unavailable)."""
+    async for event_type, data in _sse_events(
+        query, include_sources, dataset_overrides, prior_context, image_base64, image_mime
+    ):
+        yield f"event: {event_type}\ndata: {_dumps(data)}\n\n"
+
 
+if EventSourceResponse is not None:
 
-@app.post("/ask-stream")
-def post_ask_stream(body: AskRequest):
-    """Stream reasoning steps (thinking process) then final result — Perplexity/Gemini style."""
-    return StreamingResponse(
-        _sse_stream(
+    @app.post("/ask-stream", response_class=EventSourceResponse)
+    async def post_ask_stream(body: AskRequest):
+        """Stream reasoning steps (thinking process) then final result — Perplexity/Gemini style.
+        FastAPI frames each event and adds keep-alive pings plus no-cache / no-buffering headers."""
+        async for event_type, data in _sse_events(
             body.query.strip(),
             body.include_sources,
             body.dataset_overrides,
             body.prior_context,
             body.image_base64,
             body.image_mime,
-        ),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
-    )
+        ):
+            yield ServerSentEvent(event=event_type, raw_data=_dumps(data))
+
+else:
+
+    @app.post("/ask-stream")
+    def post_ask_stream(body: AskRequest):
+        """Stream reasoning steps (thinking process) then final result — Perplexity/Gemini style."""
+        return StreamingResponse(
+            _sse_stream(
+                body.query.strip(),
+                body.include_sources,
+                body.dataset_overrides,
+                body.prior_context,
+                body.image_base64,
+                body.image_mime,
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
 
 @app.post("/ask", response_model=AskResponse)
-def post_ask(body: AskRequest):
+async def post_ask(body: AskRequest):
     """Run causal reasoning: infer version, then explain why the system behaves this way."""
     try:
         client = get_gemini()
-        result = ask_engine(
+        q = body.query.strip()
+        use_cache = answer_cache.enabled and cacheable(body.dataset_overrides, body.image_base64)
+        q_emb = None
+        if use_cache:
+            cached, _, q_emb = await asyncio.to_thread(
+                answer_cache.lookup, client, q, body.include_sources, body.prior_context
+            )
+            if cached is not None:
+                return AskResponse.model_validate({**cached, "query": q})
+        result = await ask_engine(
             client,
-            body.query.strip(),
+            q,
             body.include_sources,
             body.dataset_overrides,
             body.prior_context,
@@ -308,8 +449,10 @@ def post_ask(body: AskRequest):
         )
         sources = result.get("sources", [])
         source_details = get_source_details(sources)
-        payload = _build_ask_response(result, source_details)
-        return AskResponse(**payload)
+        response = AskResponse.model_validate({**result, "source_details": source_details})
+        if use_cache:
+            answer_cache.store(client, q, body.include_sources, body.prior_context, response.model_dump(), q_emb)
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -320,7 +463,7 @@ def post_ask(body: AskRequest):
 
 
 @app.post("/emit-docs")
-def post_emit_docs(body: EmitDocsRequest):
+async def post_emit_docs(body: EmitDocsRequest):
     """Emit PR-ready Markdown reflecting true system behavior (no auto-merge)."""
     try:
         client = get_gemini()
@@ -332,7 +475,7 @@ def post_emit_docs(body: EmitDocsRequest):
             "verification": body.verification,
             "sources": body.sources,
         }
-        markdown = emit_docs_engine(client, body.inferred_version, causal)
+        markdown = await asyncio.to_thread(emit_docs_engine, client, body.inferred_version, causal)
         return {"markdown": markdown}
     except HTTPException:
         raise
@@ -344,11 +487,12 @@ def post_emit_docs(body: EmitDocsRequest):
 
 
 @app.post("/emit-reconciliation-patch")
-def post_emit_reconciliation_patch(body: EmitReconciliationPatchRequest):
+async def post_emit_reconciliation_patch(body: EmitReconciliationPatchRequest):
     """Action endpoint: generate a reconciliation patch or PR body for a finding (e.g. doc drift). No auto-merge."""
     try:
         client = get_gemini()
-        markdown = emit_reconciliation_patch_engine(
+        markdown = await asyncio.to_thread(
+            emit_reconciliation_patch_engine,
             client,
             body.finding_id.strip(),
             body.target.strip(),
@@ -365,20 +509,17 @@ def post_emit_reconciliation_patch(body: EmitReconciliationPatchRequest):
         raise HTTPException(status_code=500, detail=msg)
 
 
+# Lowercase substrings of transient Gemini errors (overload, rate limit, quota)
+_RETRY_TOKENS = ("503", "overloaded", "unavailable", "429", "resource_exhausted", "quota")
+
+
 def _is_retryable_gemini_error(e: Exception) -> bool:
     msg = str(e).lower()
-    return (
-        "503" in str(e)
-        or "overloaded" in msg
-        or "unavailable" in msg
-        or "429" in str(e)
-        or "resource_exhausted" in msg
-        or "quota" in msg
-    )
+    return any(t in msg for t in _RETRY_TOKENS)
 
 
 @app.post("/reconciliation-bundle")
-def post_reconciliation_bundle(body: EmitDocsRequest):
+async def post_reconciliation_bundle(body: EmitDocsRequest):
     """Generate Reconciliation Bundle: post_mortem (Markdown), pr_diff (Markdown), slack_summary (text). Uses GEMINI_BUNDLE_API_KEY if set."""
     client = get_gemini_bundle()
     causal = {
@@ -393,7 +534,7 @@ def post_reconciliation_bundle(body: EmitDocsRequest):
     last_error = None
     for attempt in range(3):
         try:
-            bundle = generate_reconciliation_bundle_engine(client, causal)
+            bundle = await agenerate_reconciliation_bundle_engine(client, causal)
             return bundle
         except HTTPException:
             raise
@@ -403,7 +544,8 @@ def post_reconciliation_bundle(body: EmitDocsRequest):
             if "empty bundle" in msg.lower():
                 raise HTTPException(status_code=503, detail=msg)
             if attempt < 2 and _is_retryable_gemini_error(e):
-                time.sleep(2 * (attempt + 1))
+                # Exponential backoff (2s, 4s) with jitter so concurrent retries don't hit Gemini in lockstep
+                await asyncio.sleep(2 ** (attempt + 1) + random.random())
                 continue
             if _is_retryable_gemini_error(e):
                 raise HTTPException(
@@ -419,10 +561,27 @@ def post_reconciliation_bundle(body: EmitDocsRequest):
     raise HTTPException(status_code=500, detail=str(last_error) if last_error else "Unknown error")
 
 
+@functools.lru_cache(maxsize=1)
+def _dataset_body(mtime_key: tuple[int, ...]) -> tuple[bytes, str]:
+    """Serialized /dataset payload and its ETag, rebuilt only when a dataset file changes on disk."""
+    data = get_dataset_for_api()
+    body = orjson.dumps(data) if orjson is not None else _dumps(data).encode("utf-8")
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    return any(tag.strip().removeprefix("W/") in (etag, "*") for tag in if_none_match.split(","))
+
+
 @app.get("/dataset")
-def get_dataset():
-    """Return current dataset so frontend can show and edit each source."""
-    return get_dataset_for_api()
+def get_dataset(request: Request):
+    """Return current dataset so frontend can show and edit each source.
+    Sends an ETag; a matching If-None-Match gets 304 with no body."""
+    body, etag = _dataset_body(dataset_mtime_key())
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @app.get("/")
@@ -0,0 +1,156 @@
+"""
+Answer cache for /ask and /ask-stream: replays a finished AskResponse payload instead of calling Gemini again.
+Exact layer: sha256 of the normalized query + sorted sources + prior context + dataset digest (ASKTRA_ANSWER_CACHE=1).
+Semantic layer: paraphrases hit when the query embedding is close to a cached one (ASKTRA_SEMANTIC_CACHE=1, needs numpy).
+Requests with dataset overrides or an attached image are never cached; their answers depend on that input.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+# numpy is optional: without it only exact hits are served
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().upper() in ("1", "TRUE", "YES")
+
+
+_MAX_ENTRIES = 256
+_EMBED_MODEL = os.environ.get("ASKTRA_EMBED_MODEL", "gemini-embedding-001")
+try:
+    _SEMANTIC_THRESHOLD = float(os.environ.get("ASKTRA_SEMANTIC_THRESHOLD", "0.92"))
+except ValueError:
+    _SEMANTIC_THRESHOLD = 0.92
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+class AnswerCache:
+    """In-process LRU of final /ask payloads, with an optional embedding-similarity lookup over the same entries."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        semantic: bool = False,
+        max_entries: int = _MAX_ENTRIES,
+        threshold: float = _SEMANTIC_THRESHOLD,
+        embed_model: str = _EMBED_MODEL,
+    ):
+        self.enabled = enabled or semantic
+        self.semantic = semantic and np is not None
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.embed_model = embed_model
+        # exact key -> (scope, payload); scope groups entries answerable from the same sources/context/dataset
+        self._entries: OrderedDict[str, tuple[str, dict]] = OrderedDict()
+        # exact key -> unit-length query embedding (semantic layer only)
+        self._vectors: dict[str, Any] = {}
+        # (keys, scopes, N x D matrix) stacked from _vectors; rebuilt lazily after a store or eviction
+        self._matrix: tuple[list[str], list[str], Any] | None = None
+        self._lock = threading.Lock()
+
+    def _keys(self, client: Any, query: str, include_sources: list[str] | None, prior_context: str | None) -> tuple[str, str]:
+        scope = hashlib.sha256()
+        scope.update(client.dataset_digest)
+        scope.update("\0".join(sorted(include_sources or [])).encode("utf-8"))
+        scope.update(b"\1")
+        scope.update((prior_context or "").strip().encode("utf-8"))
+        scope_hex = scope.hexdigest()
+        exact = hashlib.sha256(f"{scope_hex}\0{_normalize_query(query)}".encode("utf-8")).hexdigest()
+        return exact, scope_hex
+
+    def _embed(self, client: Any, query: str):
+        try:
+            vec = np.asarray(client.embed(_normalize_query(query), model=self.embed_model), dtype=np.float32)
+        except Exception:
+            return None
+        norm = float(np.linalg.norm(vec)) if vec.size else 0.0
+        return vec / norm if norm else None
+
+    def _stacked(self) -> tuple[list[str], list[str], Any]:
+        if self._matrix is None:
+            keys = list(self._vectors)
+            scopes = [self._entries[k][0] for k in keys]
+            matrix = np.stack([self._vectors[k] for k in keys]) if keys else None
+            self._matrix = (keys, scopes, matrix)
+        return self._matrix
+
+    def lookup(
+        self,
+        client: Any,
+        query: str,
+        include_sources: list[str] | None = None,
+        prior_context: str | None = None,
+    ) -> tuple[dict | None, str | None, Any]:
+        """(payload, "exact" | "semantic", query embedding) on a hit; (None, None, embedding) on a miss.
+        Pass the embedding back to store() so a miss doesn't embed the query twice. Blocking when semantic."""
+        exact, scope = self._keys(client, query, include_sources, prior_context)
+        with self._lock:
+            hit = self._entries.get(exact)
+            if hit is not None:
+                self._entries.move_to_end(exact)
+                return hit[1], "exact", None
+        if not self.semantic:
+            return None, None, None
+        q_emb = self._embed(client, query)
+        if q_emb is None:
+            return None, None, None
+        with self._lock:
+            keys, scopes, matrix = self._stacked()
+            if matrix is None or matrix.shape[1] != q_emb.shape[0]:
+                return None, None, q_emb
+            scores = matrix @ q_emb
+            # Only entries answered from the same sources, prior context and dataset are eligible
+            mask = np.fromiter((s == scope for s in scopes), dtype=bool, count=len(scopes))
+            if not mask.any():
+                return None, None, q_emb
+            scores = np.where(mask, scores, -1.0)
+            best = int(np.argmax(scores))
+            if scores[best] <= self.threshold:
+                return None, None, q_emb
+            key = keys[best]
+            self._entries.move_to_end(key)
+            return self._entries[key][1], "semantic", q_emb
+
+    def store(
+        self,
+        client: Any,
+        query: str,
+        include_sources: list[str] | None,
+        prior_context: str | None,
+        payload: dict,
+        embedding: Any = None,
+    ) -> None:
+        exact, scope = self._keys(client, query, include_sources, prior_context)
+        with self._lock:
+            self._entries[exact] = (scope, payload)
+            self._entries.move_to_end(exact)
+            if self.semantic and embedding is not None:
+                self._vectors[exact] = embedding
+                self._matrix = None
+            while len(self._entries) > self.max_entries:
+                old, _ = self._entries.popitem(last=False)
+                if self._vectors.pop(old, None) is not None:
+                    self._matrix = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+            self._matrix = None
+
+
+def cacheable(dataset_overrides: dict[str, Any] | None, image_base64: str | None) -> bool:
+    """Edited sources and attached images change the answer for the same query; skip the cache for those."""
+    return not dataset_overrides and not (image_base64 and image_base64.strip())
+
+
+answer_cache = AnswerCache(enabled=_flag("ASKTRA_ANSWER_CACHE"), semantic=_flag("ASKTRA_SEMANTIC_CACHE"))
@@ -1,97 +1,218 @@
 """
 Resolve source labels (e.g. "Slack 2025-09-12", "Commit 8a2f") to type + content from dataset.
 """
+import functools
 import json
 import re
 from pathlib import Path
+from typing import Any
+
+# orjson parses the dataset JSON straight from bytes; stdlib json is the fallback
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Label classifiers: which source type a citation refers to. Kept as three patterns tried in precedence
+# order (jira → slack → git): most labels stop at the first search. A combined named-group pattern either
+# drops overlapping hits (git "4f21" inside "AUTH-4f21") or, written with lookaheads, costs 2-6x per label.
+_RE_JIRA = re.compile(r"(SEC|AUTH|JIRA|PROJ)-\d+", re.I)
+_RE_SLACK = re.compile(r"slack|#\w+", re.I)
+# "commit" (also glued to a hash, "commit8a2f"), the word "git", or a standalone hex token with a digit
+# (short hashes like 8a2f are 4 chars); plain words such as "beef" or "added" no longer look like commits.
+_RE_GIT = re.compile(r"\bcommit|\bgit\b|\b(?=[a-f]*\d)[\da-f]{4,}\b", re.I)
+# A label that opens with a type keyword ("Commit 8a2f (AUTH-101)", "[Git: ...]", "#channel") is tried as
+# that type first; everything else follows the jira → slack → git order.
+_RE_LEAD = re.compile(r"[\W_]*(?:(commit|git\b)|(slack|#))", re.I)
+# Lookup keys pulled out of a classified label
+_RE_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_RE_HEX = re.compile(r"[\da-f]{4,}", re.I)
+_RE_TICKET = re.compile(r"[a-z][a-z0-9]*-\d+", re.I)
+
+_DATASET_DIR = Path(__file__).parent / "dataset"
+_DATASET_FILES = [
+    ("slack", "slack.json"),
+    ("git", "git.json"),
+    ("jira", "jira.json"),
+    ("releases", "releases.md"),
+    ("docs", "docs.md"),
+]
 
 
 def _load_dataset():
-    base = Path(__file__).parent / "dataset"
     data = {}
-    for name, path in [
-        ("slack", base / "slack.json"),
-        ("git", base / "git.json"),
-        ("jira", base / "jira.json"),
-        ("releases", base / "releases.md"),
-        ("docs", base / "docs.md"),
-    ]:
+    for name, filename in _DATASET_FILES:
+        path = _DATASET_DIR / filename
         if path.exists():
             if path.suffix == ".json":
-                data[name] = json.loads(path.read_text(encoding="utf-8"))
+                data[name] = _loads(path.read_bytes())
             else:
                 data[name] = path.read_text(encoding="utf-8")
     return data
 
 
+def dataset_mtime_key() -> tuple[int, ...]:
+    """st_mtime_ns of each dataset file (0 if missing); changes whenever a file is edited."""
+    key = []
+    for _name, filename in _DATASET_FILES:
+        try:
+            key.append((_DATASET_DIR / filename).stat().st_mtime_ns)
+        except OSError:
+            key.append(0)
+    return tuple(key)
+
+
+def _slack_content(item: dict) -> str:
+    return f"[{item.get('date', '')}] #{item.get('channel', '')} — {item.get('author', '')}: {item.get('message', '')}"
+
+
+def _git_content(item: dict) -> str:
+    content = f"commit {item.get('hash', item.get('short_hash', ''))} ({item.get('date', '')}) — {item.get('author', '')}\n  {item.get('message', '')}\n  {item.get('change', '')}"
+    diff = item.get("diff", "")
+    if diff:
+        content += f"\n  Diff:\n  {diff}"
+    return content
+
+
+def _jira_content(item: dict) -> str:
+    return f"{item.get('id', '')} — {item.get('title', '')} ({item.get('status', '')})\n  {item.get('comment', '')}"
+
+
+_CONTENT_BUILDERS = (("slack", _slack_content), ("git", _git_content), ("jira", _jira_content))
+
+
+def _attach_content(data: dict) -> None:
+    """Render each slack/git/jira item's UI text once per dataset load, stored as item["_content"],
+    plus the docs/releases excerpt shown for unmatched labels as data["_doc_fallback"] ("" without docs)."""
+    for key, build in _CONTENT_BUILDERS:
+        for item in data.get(key, []):
+            item["_content"] = build(item)
+    fallback = ""
+    if data.get("docs"):
+        fallback = data["docs"].strip()[:800]
+        if data.get("releases"):
+            fallback += "\n\n---\n\n" + data["releases"].strip()[:400]
+    data["_doc_fallback"] = fallback
+
+
+def _index_dataset(data: dict) -> dict[str, Any]:
+    """Lookup key -> position of the first slack/git/jira item with that key (first match wins, as in a scan)."""
+    index: dict[str, Any] = {
+        "slack_by_date": {},
+        "slack_by_channel": {},
+        "git_by_hash": {},  # full and short hashes, lowercase
+        "jira_by_id": {},
+    }
+    for i, item in enumerate(data.get("slack", [])):
+        index["slack_by_date"].setdefault(item.get("date", ""), i)
+        ch = item.get("channel", "")
+        if ch:
+            index["slack_by_channel"].setdefault(ch, i)
+    for i, item in enumerate(data.get("git", [])):
+        h = (item.get("hash") or item.get("short_hash") or "").lower()
+        short = (item.get("short_hash") or item.get("hash", "")[:7] or "").lower()
+        if h:
+            index["git_by_hash"].setdefault(h, i)
+            if short:
+                index["git_by_hash"].setdefault(short, i)
+    index["git_hash_lengths"] = tuple(sorted({len(k) for k in index["git_by_hash"]}))
+    for i, item in enumerate(data.get("jira", [])):
+        jid = (item.get("id") or "").upper()
+        if jid:
+            index["jira_by_id"].setdefault(jid, i)
+    return index
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dataset_cached(mtime_key: tuple[int, ...]):
+    """(dataset, index) for a given dataset_mtime_key(); shared across requests, treat as read-only."""
+    data = _load_dataset()
+    _attach_content(data)
+    return data, _index_dataset(data)
+
+
+def warm_dataset() -> None:
+    """Load and index the dataset ahead of get_source_details (no-op when already cached)."""
+    _load_dataset_cached(dataset_mtime_key())
+
+
+def _find_slack(s: str, index: dict) -> int | None:
+    by_date = index["slack_by_date"]
+    hits = [by_date[d] for d in _RE_DATE.findall(s) if d in by_date]
+    if "" in by_date:  # an item without a date matches any label
+        hits.append(by_date[""])
+    hits.extend(i for ch, i in index["slack_by_channel"].items() if ch in s)
+    return min(hits) if hits else None
+
+
+def _find_git(s: str, index: dict) -> int | None:
+    # A cited hash may be shorter (short hash) or longer (full SHA) than the one in the dataset,
+    # so try each known hash length against both ends of every hex token in the label.
+    by_hash = index["git_by_hash"]
+    hits = []
+    for tok in _RE_HEX.findall(s.lower()):
+        for n in index["git_hash_lengths"]:
+            if n <= len(tok):
+                for key in (tok[:n], tok[-n:]):
+                    if key in by_hash:
+                        hits.append(by_hash[key])
+    return min(hits) if hits else None
+
+
+def _find_jira(s: str, index: dict) -> int | None:
+    by_id = index["jira_by_id"]
+    hits = [by_id[t] for t in (m.upper() for m in _RE_TICKET.findall(s)) if t in by_id]
+    return min(hits) if hits else None
+
+
+def _resolve(typ: str, s: str, data: dict, index: dict) -> dict | None:
+    """Entry for label s as source type typ, or None when the label doesn't look like / match that type."""
+    if typ == "jira":
+        # Jira: "SEC-442", "AUTH-101"
+        i = _find_jira(s, index) if _RE_JIRA.search(s) else None
+    elif typ == "slack":
+        # Slack: "Slack 2025-09-12", "Slack#security-alerts"
+        if not _RE_SLACK.search(s):
+            return None
+        i = _find_slack(s, index)
+        if i is None and data.get("slack"):
+            i = 0
+    else:
+        # Git: "Commit 8a2f", "Git: 8a2f", "8a2f4c9"
+        i = _find_git(s, index) if _RE_GIT.search(s) else None
+    if i is None:
+        return None
+    return {"type": typ, "label": s, "content": data[typ][i]["_content"]}
+
+
 def get_source_details(sources: list[str]) -> list[dict]:
     """Turn a list of source labels into [{ type, label, content }, ...] for the UI."""
     if not sources:
         return []
-    data = _load_dataset()
+    data, index = _load_dataset_cached(dataset_mtime_key())
     out = []
-    seen = set()
+    # Stripped, non-empty labels in first-seen order
+    labels = dict.fromkeys(s for s in (r.strip() for r in sources if r) if s)
 
-    for raw in sources:
-        s = (raw or "").strip()
-        if not s or s in seen:
-            continue
-        seen.add(s)
+    for s in labels:
+        lead = _RE_LEAD.match(s)
+        if lead is None:
+            order = ("jira", "slack", "git")
+        elif lead.group(1):
+            order = ("git", "jira", "slack")
+        else:
+            order = ("slack", "jira", "git")
         entry = None
-        typ = "document"
-        content = ""
-
-        # Slack: "Slack 2025-09-12", "Slack#security-alerts"
-        if re.search(r"slack|#\w+", s, re.I):
-            typ = "slack"
-            for item in data.get("slack", []):
-                date = item.get("date", "")
-                ch = item.get("channel", "")
-                if date in s or (ch and ch in s):
-                    content = f"[{item.get('date', '')}] #{item.get('channel', '')} — {item.get('author', '')}: {item.get('message', '')}"
-                    entry = {"type": typ, "label": s, "content": content}
-                    break
-            if not entry and data.get("slack"):
-                item = data["slack"][0]
-                content = f"[{item.get('date', '')}] #{item.get('channel', '')} — {item.get('author', '')}: {item.get('message', '')}"
-                entry = {"type": typ, "label": s, "content": content}
-
-        # Git: "Commit 8a2f", "8a2f"
-        if not entry and re.search(r"commit|[\da-f]{4,}", s, re.I):
-            for item in data.get("git", []):
-                h = (item.get("hash") or item.get("short_hash") or "").lower()
-                short = (item.get("short_hash") or item.get("hash", "")[:7] or "").lower()
-                if h and (h in s.lower() or s.lower().endswith(h) or short in s.lower() or s.lower().endswith(short)):
-                    typ = "git"
-                    diff = item.get("diff", "")
-                    content = f"commit {item.get('hash', item.get('short_hash', ''))} ({item.get('date', '')}) — {item.get('author', '')}\n  {item.get('message', '')}\n  {item.get('change', '')}"
-                    if diff:
-                        content += f"\n  Diff:\n  {diff}"
-                    entry = {"type": typ, "label": s, "content": content}
-                    break
-
-        # Jira: "SEC-442", "AUTH-101"
-        if not entry and re.search(r"(SEC|AUTH|JIRA|PROJ)-\d+", s, re.I):
-            typ = "jira"
-            for item in data.get("jira", []):
-                jid = (item.get("id") or "").upper()
-                if jid and jid in s.upper():
-                    content = f"{item.get('id', '')} — {item.get('title', '')} ({item.get('status', '')})\n  {item.get('comment', '')}"
-                    entry = {"type": typ, "label": s, "content": content}
-                    break
+        for typ in order:
+            entry = _resolve(typ, s, data, index)
+            if entry:
+                break
 
         # Doc / releases: fallback
         if not entry:
-            typ = "document"
-            if data.get("docs"):
-                content = (data["docs"] or "").strip()[:800]
-                if data.get("releases"):
-                    content += "\n\n---\n\n" + (data["releases"] or "").strip()[:400]
-            else:
-                content = s
-            entry = {"type": typ, "label": s, "content": content or s}
+            entry = {"type": "document", "label": s, "content": data["_doc_fallback"] or s}
 
-        if entry:
-            out.append(entry)
+        out.append(entry)
 
     return out
@@ -165,7 +165,9 @@ export default function App() {
           const [, eventType, dataStr] = eventMatch
           try {
             const data = JSON.parse(dataStr.trim())
-            if ((eventType === 'step' || eventType === 'status') && data.message) {
+            if (eventType === 'steps' && Array.isArray(data.messages)) {
+              setThinkingSteps((prev) => [...prev, ...data.messages])
+            } else if ((eventType === 'step' || eventType === 'status') && data.message) {
               setThinkingSteps((prev) => [...prev, data.message])
             } else if (eventType === 'result') {
               setResult(data)
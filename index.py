@@ -1,7 +1,9 @@
 """
 Vercel entrypoint: single FastAPI app — frontend at /, backend at /api.
 Fully defensive: any failure falls back to a minimal app so the function never crashes.
+The backend module is imported lazily, so serving the static frontend never pays for its import.
 """
+import importlib.util
 import sys
 import traceback
 from pathlib import Path
@@ -10,10 +12,49 @@ from pathlib import Path
 _app = None
 _startup_error = None
 
+
+class _LazyBackend:
+    """ASGI app mounted at /api: runs backend/main.py on the first request (LazyLoader) and forwards to its app.
+    A failed import is remembered and answered with 503 instead of crashing the function."""
+
+    def __init__(self, backend_dir: Path):
+        self.error = None
+        self._app = None
+        # Load backend/main.py by path under its own name (same as api/main.py); its flat sibling imports
+        # (gemini_client, source_resolver) still need the directory on sys.path.
+        if str(backend_dir) not in sys.path:
+            sys.path.append(str(backend_dir))
+        spec = importlib.util.spec_from_file_location("backend_main", backend_dir / "main.py")
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        self._module = importlib.util.module_from_spec(spec)
+        sys.modules["backend_main"] = self._module
+        spec.loader.exec_module(self._module)  # deferred until the first attribute access
+
+    def _resolve(self):
+        if self._app is None and self.error is None:
+            try:
+                self._app = self._module.app
+            except Exception as e:
+                sys.modules.pop("backend_main", None)
+                self.error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+        return self._app
+
+    async def __call__(self, scope, receive, send):
+        backend_app = self._resolve()
+        if backend_app is not None:
+            await backend_app(scope, receive, send)
+            return
+        from fastapi.responses import JSONResponse
+
+        response = JSONResponse(
+            status_code=503,
+            content={"detail": "Backend failed to load.", "error": (self.error or "")[:500]},
+        )
+        await response(scope, receive, send)
+
+
 try:
     from fastapi import FastAPI
-    from fastapi.responses import JSONResponse
-    from fastapi.staticfiles import StaticFiles
 
     _root = Path(__file__).resolve().parent
     _backend_dir = _root / "backend"
@@ -21,11 +62,10 @@ try:
     backend_error = None
 
     if _backend_dir.exists() and (_backend_dir / "main.py").exists():
-        sys.path.insert(0, str(_backend_dir))
         try:
-            from main import app as _backend_app  # noqa: E402
-            backend_app = _backend_app
+            backend_app = _LazyBackend(_backend_dir)
         except Exception as e:
+            sys.modules.pop("backend_main", None)
             backend_error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
 
     app = FastAPI(title="Asktra")
@@ -34,6 +74,8 @@ try:
         app.mount("/api", backend_app)
     else:
         def _api_err():
+            from fastapi.responses import JSONResponse
+
             return JSONResponse(
                 status_code=503,
                 content={
@@ -55,11 +97,15 @@ try:
     _dist = _root / "frontend" / "dist"
     if _dist.exists() and (_dist / "index.html").exists():
         try:
+            from fastapi.staticfiles import StaticFiles
+
             app.mount("/", StaticFiles(directory=str(_dist), html=True), name="static")
         except Exception as e:
             _startup_error = f"StaticFiles mount failed: {e}"
             @app.get("/")
             def root_fallback():
+                from fastapi.responses import JSONResponse
+
                 return JSONResponse(
                     status_code=200,
                     content={
@@ -74,7 +120,7 @@ try:
             return {
                 "service": "asktra",
                 "message": "Frontend not built or path not found.",
-                "api_status": "error" if backend_error else "ok",
+                "api_status": "error" if backend_error or (backend_app is not None and backend_app.error) else "ok",
             }
 
     _app = app